@@ -1,18 +1,17 @@
 import pandas as pd
 import re
 import os
+from emoji_tokens import EMOJI_SEQUENCE
 
-# =============================================================================
-# STEP 1: Extract emojis and descriptions from LLM CSV files and combine with Human response
-# =============================================================================
-
-# Read the Human response CSV file
-human_df = pd.read_csv('Human response.csv')
+# Default input / output files
+HUMAN_CSV = 'Human response.csv'
+COMBINED_CSV = 'Human_response_with_LLMs_combined.csv'
+FINAL_CSV = 'Human_response_final.csv'
 
 # List of LLM CSV files and their corresponding column names
-llm_files = [
+LLM_FILES = [
     'Qwen2.5-1.5B.csv',
-    'Qwen2.5-14B.csv', 
+    'Qwen2.5-14B.csv',
     'gemma-3-1b.csv',
     'Qwen2.5-7B.csv',
     'gemma-3-4b.csv',
@@ -21,35 +20,101 @@ llm_files = [
     'Yi-1.5-9B.csv'
 ]
 
+# Unicode emoji ranges used to pick emojis out of the responses
+EMOJI_RANGES = (
+    "\U0001F600-\U0001F64F"  # emoticons
+    "\U0001F300-\U0001F5FF"  # symbols & pictographs
+    "\U0001F680-\U0001F6FF"  # transport & map symbols
+    "\U0001F1E0-\U0001F1FF"  # flags (iOS)
+    "\U00002702-\U000027B0"  # other symbols
+    "\U000024C2-\U0001F251"  # enclosed characters
+)
+
+# Extract emojis using regex (Unicode emoji range)
+emoji_pattern = re.compile("[" + EMOJI_RANGES + "]+", flags=re.UNICODE)
+
+# Boilerplate that models append after the actual answer
+BOILERPLATE_MARKERS = [
+    'To help me narrow it down',
+    'Which one is best depends',
+    'Would you like me to',
+    'Do you want me to',
+    'Let me know if',
+    'I hope this helps',
+]
+
+# Complete emoji sequences, the same ones extract_complete_emojis finds, plus
+# flags: emoji.EMOJI_DATA only lists regional indicators in pairs
+FLAG_SEQUENCE = "[\U0001F1E6-\U0001F1FF]{2}"
+EMOJI_OR_FLAG = "(?:" + FLAG_SEQUENCE + "|" + EMOJI_SEQUENCE + ")"
+emoji_sequence_pattern = re.compile(EMOJI_OR_FLAG)
+
+# One precompiled rule set for the description. Every artifact is matched by a
+# named alternative and handled in a single left-to-right pass (clean_response)
+description_rules = re.compile(
+    "(?P<boilerplate>(?i:" + "|".join(re.escape(marker) for marker in BOILERPLATE_MARKERS) + "))"
+    "|(?P<emoji>" + EMOJI_OR_FLAG + ")"
+    # Possessive, so an unclosed "(" before a long emoji run fails in linear time
+    "|(?P<empty>\\((?:[\\s\u200d\ufe0f]|" + EMOJI_OR_FLAG + ")*+\\))"  # "()" left behind by emojis
+    "|(?P<bold>\\*\\*|__)"                                               # **bold** / __bold__ markers
+    "|(?P<bullet>(?:^|\\n)[ \\t]*(?:[-*\u2022]|\\d+\\.)(?=\\s))"         # "- ", "* ", "• ", "1. " list bullets
+    "|(?P<joiner>[\u200d\ufe0f\u20e3]+)"                                 # ZWJ / variation selectors not attached to an emoji
+    "|(?P<lead>[:\\-](?=\\s|$))"                                         # ":" / "-" separator, dropped before the first word
+    "|(?P<space>[^\\S\\n]+|\\n)",                                         # one newline at a time, so bullets see it
+    flags=re.UNICODE
+)
+
+# Split a response into its emojis and a cleaned-up description
+def clean_response(text, truncate_boilerplate=False):
+    """Return (emojis, description); optionally drop everything from the first boilerplate marker"""
+    emojis = []
+    parts = []
+    pending_space = False
+
+    def emit(chunk):
+        nonlocal pending_space
+        if pending_space and parts:
+            parts.append(' ')
+        parts.append(chunk)
+        pending_space = False
+
+    pos = 0
+    for match in description_rules.finditer(text):
+        if match.start() > pos:
+            emit(text[pos:match.start()])
+        pos = match.end()
+        kind = match.lastgroup
+
+        if kind == 'boilerplate':
+            if truncate_boilerplate:
+                # Keep the emojis of the dropped part, only the text goes
+                emojis.extend(emoji_sequence_pattern.findall(text, pos))
+                pos = len(text)
+                break
+            emit(match.group())
+        elif kind == 'emoji':
+            emojis.append(match.group())
+        elif kind == 'empty':
+            emojis.extend(emoji_sequence_pattern.findall(match.group()))
+        elif kind in ('bullet', 'space'):
+            pending_space = True
+        elif kind == 'lead' and parts:
+            # Only a separator at the start of the description is dropped
+            emit(match.group())
+        # bold markers and stray joiners are dropped
+
+    if pos < len(text):
+        emit(text[pos:])
+
+    return ''.join(emojis), ''.join(parts)
+
 # Function to extract emojis and descriptions from response
-def extract_emojis_and_description(text):
+def extract_emojis_and_description(text, truncate_boilerplate=False):
     if pd.isna(text):
         return ""
-    
-    text = str(text)
-    
-    # Extract emojis using regex (Unicode emoji range)
-    emoji_pattern = re.compile(
-        "["
-        "\U0001F600-\U0001F64F"  # emoticons
-        "\U0001F300-\U0001F5FF"  # symbols & pictographs
-        "\U0001F680-\U0001F6FF"  # transport & map symbols
-        "\U0001F1E0-\U0001F1FF"  # flags (iOS)
-        "\U00002702-\U000027B0"  # other symbols
-        "\U000024C2-\U0001F251"  # enclosed characters
-        "]+", 
-        flags=re.UNICODE
-    )
-    
-    emojis = ''.join(emoji_pattern.findall(text))
-    
-    # Extract description (text without emojis)
-    description = emoji_pattern.sub('', text).strip()
-    
-    # Clean up description - remove extra spaces and common prefixes
-    description = re.sub(r'\s+', ' ', description)
-    description = re.sub(r'^[:\-]\s*', '', description)
-    
+
+    emojis, description = clean_response(str(text), truncate_boilerplate)
+
     # Combine emojis and description
     if emojis and description:
         return f"{emojis} - {description}"
@@ -60,78 +125,87 @@ def extract_emojis_and_description(text):
     else:
         return ""
 
-# Process each LLM file and add as a new column
-for llm_file in llm_files:
-    if os.path.exists(llm_file):
-        # Read the LLM CSV file
-        llm_df = pd.read_csv(llm_file)
-        
-        # Extract the base name for column naming (remove .csv extension)
-        col_name = llm_file.replace('.csv', '')
-        
-        # Apply the extraction function to the response column
-        human_df[col_name] = llm_df['response'].apply(extract_emojis_and_description)
-        
-        print(f"Processed {llm_file} -> Added column '{col_name}'")
-    else:
-        print(f"Warning: {llm_file} not found")
-
-# Save the intermediate combined CSV
-human_df.to_csv('Human_response_with_LLMs_combined.csv', index=False)
-print("\nStep 1 completed: Combined CSV saved as 'Human_response_with_LLMs_combined.csv'")
-
-# =============================================================================
-# STEP 2: Remove all text from first 10 responses, keeping only emojis
-# =============================================================================
-
-# Read the combined CSV file
-df = pd.read_csv('Human_response_with_LLMs_combined.csv')
-
-# List of LLM columns (excluding 'Question' and 'Human Response')
-llm_columns = [col for col in df.columns if col not in ['Question', 'Human Response']]
-
 # Function to extract only emojis from text (remove ALL other characters)
 def extract_only_emojis(text):
     if pd.isna(text) or text == "":
         return ""
-    
+
     text = str(text)
-    
-    # Extract emojis using regex (Unicode emoji range)
-    emoji_pattern = re.compile(
-        "["
-        "\U0001F600-\U0001F64F"  # emoticons
-        "\U0001F300-\U0001F5FF"  # symbols & pictographs
-        "\U0001F680-\U0001F6FF"  # transport & map symbols
-        "\U0001F1E0-\U0001F1FF"  # flags (iOS)
-        "\U00002702-\U000027B0"  # other symbols
-        "\U000024C2-\U0001F251"  # enclosed characters
-        "]+", 
-        flags=re.UNICODE
-    )
-    
+
     # Find all emojis
     emojis = emoji_pattern.findall(text)
-    
+
     # Join all emojis together and remove ANY non-emoji characters
     emoji_only = ''.join(emojis)
-    
+
     return emoji_only
 
-# Apply the function to first 10 rows of each LLM column
-for col in llm_columns:
-    # Apply to first 10 rows only (emoji selection tasks)
-    df.loc[:9, col] = df.loc[:9, col].apply(extract_only_emojis)
+def combine(human_csv=HUMAN_CSV, llm_files=LLM_FILES, combined_csv=COMBINED_CSV,
+            final_csv=FINAL_CSV, emoji_rows=10, truncate_boilerplate=False):
+    """Combine the human and LLM responses; keep only emojis in the first emoji_rows rows
+
+    truncate_boilerplate drops everything from the first BOILERPLATE_MARKERS phrase in a description
+    """
+
+    # =============================================================================
+    # STEP 1: Extract emojis and descriptions from LLM CSV files and combine with Human response
+    # =============================================================================
+
+    # A missing model would silently drop its column from the output files
+    missing = [llm_file for llm_file in llm_files if not os.path.exists(llm_file)]
+    if missing:
+        raise FileNotFoundError(f"LLM response files not found: {', '.join(missing)}")
+
+    # Read the Human response CSV file
+    human_df = pd.read_csv(human_csv)
+
+    # Process each LLM file and add as a new column
+    for llm_file in llm_files:
+        # Read the LLM CSV file
+        llm_df = pd.read_csv(llm_file)
+
+        # Extract the base name for column naming (remove .csv extension)
+        col_name = os.path.basename(llm_file).replace('.csv', '')
+
+        # Apply the extraction function to the response column
+        human_df[col_name] = llm_df['response'].apply(extract_emojis_and_description,
+                                                      truncate_boilerplate=truncate_boilerplate)
+
+        print(f"Processed {llm_file} -> Added column '{col_name}'")
+
+    # Save the intermediate combined CSV
+    human_df.to_csv(combined_csv, index=False)
+    print(f"\nStep 1 completed: Combined CSV saved as '{combined_csv}'")
+
+    # =============================================================================
+    # STEP 2: Remove all text from first 10 responses, keeping only emojis
+    # =============================================================================
+
+    # Read the combined CSV file
+    df = pd.read_csv(combined_csv)
+
+    # List of LLM columns (excluding 'Question' and 'Human Response')
+    llm_columns = [col for col in df.columns if col not in ['Question', 'Human Response']]
+
+    # Apply the function to first 10 rows of each LLM column
+    for col in llm_columns:
+        # Apply to first 10 rows only (emoji selection tasks)
+        df.loc[:emoji_rows - 1, col] = df.loc[:emoji_rows - 1, col].apply(extract_only_emojis)
+
+    # Save the final CSV
+    df.to_csv(final_csv, index=False)
+
+    print(f"\nStep 2 completed: Final CSV saved as '{final_csv}'")
+    print(f"First {emoji_rows} rows of LLM columns now contain ONLY emojis (all text removed)")
+    print(f"Rows {emoji_rows + 1}+ retain original emojis + descriptions for sentiment analysis")
 
-# Save the final CSV
-df.to_csv('Human_response_final.csv', index=False)
+    # Display summary
+    print(f"\nFinal DataFrame shape: {df.shape}")
+    print("Columns:", list(df.columns))
+    print("\nSample of first 3 rows:")
+    print(df.head(3))
 
-print("\nStep 2 completed: Final CSV saved as 'Human_response_final.csv'")
-print("First 10 rows of LLM columns now contain ONLY emojis (all text removed)")
-print("Rows 11+ retain original emojis + descriptions for sentiment analysis")
+    return df
 
-# Display summary
-print(f"\nFinal DataFrame shape: {df.shape}")
-print("Columns:", list(df.columns))
-print("\nSample of first 3 rows:")
-print(df.head(3))
\ No newline at end of file
+if __name__ == '__main__':
+    combine()
@@ -0,0 +1,249 @@
+import base64
+import html
+import io
+import json
+import os
+import re
+from string import Template
+
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from emoji_tokens import count_categories, get_model_columns, load_category_sets
+from emoji_repeats import degeneration_report
+from sentiment_score import load_sentiment_labels, sentiment_agreement
+
+
+# =============================================================================
+# Static site generator for the Results page of index.html
+# =============================================================================
+# The Results page is rendered from aggregated metrics instead of being edited
+# by hand. Everything between the BEGIN/END markers in index.html is replaced;
+# the rest of the page stays hand-written.
+
+BEGIN_MARKER = '<!-- BEGIN GENERATED RESULTS -->'
+END_MARKER = '<!-- END GENERATED RESULTS -->'
+TEMPLATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates', 'results.html')
+
+# Assets up to this size are inlined as data URIs, bigger ones go to ASSET_DIR
+# next to the generated page
+INLINE_LIMIT = 16 * 1024
+ASSET_DIR = 'site_assets'
+
+# Tables with more rows than this are split into pages
+TABLE_PAGE_SIZE = 20
+
+MIME_TYPES = {'svg': 'image/svg+xml', 'webp': 'image/webp', 'png': 'image/png'}
+
+# Keep chart text as text (much smaller SVGs) and make the output reproducible
+plt.rcParams['svg.fonttype'] = 'none'
+plt.rcParams['svg.hashsalt'] = 'emoji-and-sentiment-analysis'
+
+
+# ====== METRICS ======
+def collect_metrics(final_csv='Human_response_final.csv', categories_csv='emoji_categories.csv',
+                    sentiment_csv='11-20.csv', emoji_rows=10, cache=None):
+    """Aggregate category counts, degeneration and sentiment agreement into a dict"""
+    emotion_categories, concrete_categories, emotion_base_set, concrete_base_set = load_category_sets(categories_csv)
+
+    # Only the first emoji_rows prompts are emoji selection tasks
+    df = pd.read_csv(final_csv, encoding='utf-8-sig').head(emoji_rows)
+    model_columns = get_model_columns(df)
+    degeneration = degeneration_report(df, model_columns, cache=cache).set_index('Model')
+
+    models = []
+    llm_counts = {'total': 0, 'emotion': 0, 'concrete': 0, 'other': 0}
+    for model_col in model_columns:
+        counts = count_categories(df[model_col].dropna(), emotion_base_set, concrete_base_set, cache)
+        for key in llm_counts:
+            llm_counts[key] += counts[key]
+        models.append({'model': model_col, **counts,
+                       'degeneration_rate': float(degeneration.loc[model_col, 'Degeneration_Rate'])})
+
+    sentences, labels = load_sentiment_labels(sentiment_csv)
+
+    return {
+        'categories': {
+            'emotion': ''.join(emotion_categories),
+            'concrete': ''.join(concrete_categories),
+        },
+        'human': count_categories(df['Human Response'].dropna(), emotion_base_set, concrete_base_set, cache),
+        'llm': llm_counts,
+        'models': models,
+        'sentiment': {
+            'agreement': sentiment_agreement(labels),
+            'rows': [
+                {'sentence': sentence, 'labels': labels.iloc[i].to_dict()}
+                for i, sentence in enumerate(sentences)
+            ],
+        },
+    }
+
+
+# ====== ASSETS ======
+def embed_asset(data, filename, asset_dir=ASSET_DIR, page_dir='.'):
+    """Return an <img> src: a data URI for small assets, a path relative to page_dir otherwise"""
+    mime = MIME_TYPES[filename.rsplit('.', 1)[-1]]
+    if len(data) <= INLINE_LIMIT:
+        return f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}"
+
+    os.makedirs(asset_dir, exist_ok=True)
+    path = os.path.join(asset_dir, filename)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return os.path.relpath(path, page_dir).replace(os.sep, '/')
+
+
+def render_chart(fig, name, alt, chart_format='svg', asset_dir=ASSET_DIR, page_dir='.'):
+    """Save a matplotlib figure as SVG (or WebP) and return responsive <img> markup"""
+    buf = io.BytesIO()
+    save_kwargs = {'metadata': {'Date': None}} if chart_format == 'svg' else {'dpi': 150}
+    fig.savefig(buf, format=chart_format, bbox_inches='tight', facecolor='white', **save_kwargs)
+    plt.close(fig)
+
+    data = buf.getvalue()
+    if chart_format == 'svg':
+        # Drop the XML prolog/comments and inter-tag whitespace
+        text = data.decode('utf-8')
+        text = re.sub(r'<\?xml.*?\?>|<!DOCTYPE.*?>|<!--.*?-->', '', text, flags=re.DOTALL)
+        data = re.sub(r'>\s+<', '><', text).strip().encode('utf-8')
+
+    src = embed_asset(data, f'{name}.{chart_format}', asset_dir, page_dir)
+    return (f'<img src="{src}" alt="{html.escape(alt)}" class="zoom-hover" '
+            f'style="max-width:105%; height:auto;" loading="lazy">')
+
+
+def category_bar_chart(counts, title):
+    fig, ax = plt.subplots(figsize=(8, 5))
+    values = [counts['emotion'], counts['concrete']]
+    bars = ax.bar(['Emotion Category', 'Non-emotion Category'], values,
+                  color=['#FF6B6B', '#4ECDC4'], edgecolor=['#D95D5D', '#3EB7AF'],
+                  width=0.6, linewidth=2, zorder=3)
+
+    for bar, count in zip(bars, values):
+        percentage = (count / counts['total']) * 100 if counts['total'] else 0
+        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height(),
+                f'{count}\n({percentage:.1f}%)',
+                ha='center', va='bottom', fontsize=13, fontweight='bold', color='#2C3E50')
+
+    ax.set_title(title, fontsize=15, fontweight='bold', color='#2C3E50')
+    ax.set_ylabel('Number of Emojis', color='#2C3E50')
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.yaxis.grid(True, color='#EEEEEE', zorder=0)
+    if max(values):
+        ax.set_ylim(0, max(values) * 1.25)
+    return fig
+
+
+def sentiment_bar_chart(agreement):
+    fig, ax = plt.subplots(figsize=(9, 5))
+    models = list(agreement)
+    ax.bar(models, [agreement[m] * 100 for m in models], color='#4361ee', zorder=3)
+    ax.set_title('Agreement with the human sentiment label', fontsize=15, fontweight='bold', color='#2C3E50')
+    ax.set_ylabel('Agreement (%)', color='#2C3E50')
+    ax.set_ylim(0, 100)
+    ax.tick_params(axis='x', rotation=30)
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.yaxis.grid(True, color='#EEEEEE', zorder=0)
+    return fig
+
+
+# ====== TABLES ======
+def render_table(headers, rows, page_size=TABLE_PAGE_SIZE):
+    """Render a <table>; more than page_size rows are split into pages with a pager"""
+    head = ''.join(f'<th>{html.escape(str(h))}</th>' for h in headers)
+    pages = [rows[i:i + page_size] for i in range(0, len(rows), page_size)] or [[]]
+
+    bodies = []
+    for page_no, page in enumerate(pages):
+        body = ''.join('<tr>' + ''.join(f'<td>{html.escape(str(cell))}</td>' for cell in row) + '</tr>'
+                       for row in page)
+        hidden = ' hidden' if page_no else ''
+        bodies.append(f'<tbody class="table-page" data-page="{page_no}"{hidden}>{body}</tbody>')
+
+    table = f'<table><thead><tr>{head}</tr></thead>{"".join(bodies)}</table>'
+    if len(pages) == 1:
+        return table
+    return (f'<div class="paged-table">{table}'
+            f'<div class="table-pager"><button type="button" data-step="-1">‹</button>'
+            f'<span class="table-pager-label">1 / {len(pages)}</span>'
+            f'<button type="button" data-step="1">›</button></div></div>')
+
+
+# ====== PAGE ======
+def render_results(metrics, chart_format='svg', asset_dir=ASSET_DIR, page_size=TABLE_PAGE_SIZE, page_dir='.'):
+    """Render the Results page body from collect_metrics() output"""
+    with open(TEMPLATE_FILE, encoding='utf-8') as f:
+        template = Template(f.read())
+
+    sentiment = metrics['sentiment']
+    sentiment_models = list(sentiment['agreement'])
+
+    return template.substitute(
+        category_table=render_table(
+            ['Emotion', 'Non-emotion'],
+            [[metrics['categories']['emotion'], metrics['categories']['concrete']]]),
+        human_chart=render_chart(
+            category_bar_chart(metrics['human'], 'Emoji Category Distribution in Human Responses'),
+            'bar-chart-human', 'Category distribution in Human response', chart_format, asset_dir, page_dir),
+        llm_chart=render_chart(
+            category_bar_chart(metrics['llm'], 'Emoji Category Distribution in LLM Responses'),
+            'bar-chart-llm', 'Category distribution in LLM response', chart_format, asset_dir, page_dir),
+        model_table=render_table(
+            ['Model', 'Total emojis', 'Emotion', 'Non-emotion', 'Other', 'Degeneration rate'],
+            [[m['model'], m['total'], m['emotion'], m['concrete'], m['other'], f"{m['degeneration_rate']:.0%}"]
+             for m in metrics['models']],
+            page_size),
+        sentiment_chart=render_chart(
+            sentiment_bar_chart(sentiment['agreement']),
+            'bar-chart-sentiment', 'Sentiment agreement per model', chart_format, asset_dir, page_dir),
+        sentiment_table=render_table(
+            ['Sentence', 'Human'] + sentiment_models,
+            [[row['sentence'], row['labels']['Human Response']] + [row['labels'][m] for m in sentiment_models]
+             for row in sentiment['rows']],
+            page_size),
+    )
+
+
+def write_results(index_file, results_html, output_file=None):
+    """Replace everything between the generated-results markers in index_file
+
+    The page is written to output_file, or back to index_file when it is None
+    """
+    with open(index_file, encoding='utf-8') as f:
+        page = f.read()
+
+    start = page.index(BEGIN_MARKER) + len(BEGIN_MARKER)
+    end = page.index(END_MARKER)
+    page = page[:start] + '\n' + results_html.rstrip() + '\n' + page[end:]
+
+    with open(output_file or index_file, 'w', encoding='utf-8') as f:
+        f.write(page)
+
+
+def build_site(final_csv='Human_response_final.csv', categories_csv='emoji_categories.csv',
+               sentiment_csv='11-20.csv', index_file='index.html', metrics_json='results_metrics.json',
+               chart_format='svg', cache=None, output_file=None, asset_dir=None):
+    """Collect the metrics, save them to metrics_json and regenerate the Results page
+
+    Charts too big to inline go to asset_dir, by default ASSET_DIR next to the written page
+    """
+    metrics = collect_metrics(final_csv, categories_csv, sentiment_csv, cache=cache)
+    with open(metrics_json, 'w', encoding='utf-8') as f:
+        json.dump(metrics, f, ensure_ascii=False, indent=2)
+    print(f"Metrics saved to '{metrics_json}'")
+
+    page_dir = os.path.dirname(output_file or index_file) or '.'
+    if asset_dir is None:
+        asset_dir = os.path.join(page_dir, ASSET_DIR)
+    write_results(index_file, render_results(metrics, chart_format, asset_dir, page_dir=page_dir), output_file)
+    print(f"Results page regenerated in '{output_file or index_file}'")
+    return metrics
+
+
+if __name__ == '__main__':
+    build_site()
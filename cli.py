@@ -0,0 +1,392 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import pandas as pd
+
+import ALLTO
+import LLMbar
+import humanbar
+import build_site
+import emoji_ngrams
+import emoji_repeats
+import export_explorer
+import prompt_sets
+import sentiment_score
+from emoji_tokens import extract_complete_emojis, get_model_columns
+from token_cache import CACHE_FILE, TokenCache
+
+
+# =============================================================================
+# Command-line entry point for the whole pipeline
+# =============================================================================
+#   python cli.py combine   -> ALLTO.py: combine human + LLM responses
+#   python cli.py analyze   -> LLMbar.py / humanbar.py: category counts
+#   python cli.py chart     -> bar charts from the analyze results
+#   python cli.py score     -> sentiment agreement with the human labels
+#   python cli.py bench     -> time the tokenization-heavy stages
+#   python cli.py shards    -> many prompt sets / languages, one worker per shard
+#   python cli.py run       -> every stage as a DAG, independent stages in parallel
+
+ANALYSIS_FILES = {'llm': 'llm_analysis.json', 'human': 'human_analysis.json'}
+CHART_FILES = {'llm': LLMbar.CHART_FILE, 'human': humanbar.CHART_FILE}
+
+# `run` writes every output into --results-dir so it never overwrites the
+# tracked data files or index.html (option dest -> file name)
+RUN_OUTPUTS = {
+    'combined': ALLTO.COMBINED_CSV,
+    'final': ALLTO.FINAL_CSV,
+    'detailed': LLMbar.DETAILED_CSV,
+    'summary': LLMbar.SUMMARY_CSV,
+    'agreement': sentiment_score.AGREEMENT_CSV,
+    'degeneration': 'degeneration_by_model.csv',
+    'ngram_index': 'emoji_ngram_index.npz',
+    'explorer_dir': export_explorer.EXPLORER_DIR,
+    'metrics': 'results_metrics.json',
+    'site_output': 'index.html',
+}
+
+# Inputs read instead of the combine outputs when `run --skip combine` is used
+SKIPPED_COMBINE_INPUTS = {
+    'combined': export_explorer.COMBINED_CSV,
+    'final': ALLTO.FINAL_CSV,
+}
+
+
+def _targets(target):
+    return ['llm', 'human'] if target == 'all' else [target]
+
+
+def _open_cache(args):
+    """TokenCache for --cache, or a no-op context (cache=None) for --no-cache"""
+    return TokenCache(args.cache) if args.cache else contextlib.nullcontext()
+
+
+def _write_json(data, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    print(f"Results saved to '{path}'")
+
+
+# ====== STAGES ======
+# Every stage takes the parsed arguments so it can be sent to a worker process
+
+def stage_combine(args):
+    ALLTO.combine(args.human, args.llm_files, args.combined, args.final, args.emoji_rows,
+                  args.truncate_boilerplate)
+
+
+def stage_analyze(args, target):
+    with _open_cache(args) as cache:
+        if target == 'llm':
+            results = LLMbar.analyze_llm(args.input, args.categories, collapse=args.collapse_repeats,
+                                         emoji_rows=args.emoji_rows, detailed_csv=args.detailed,
+                                         summary_csv=args.summary, cache=cache)
+        else:
+            results = humanbar.analyze_human(args.input, args.categories, emoji_rows=args.emoji_rows,
+                                             cache=cache)
+    _write_json(results, os.path.join(args.results_dir, ANALYSIS_FILES[target]))
+
+
+def stage_chart(args, target):
+    with open(os.path.join(args.results_dir, ANALYSIS_FILES[target]), encoding='utf-8') as f:
+        results = json.load(f)
+    output_file = os.path.join(args.results_dir, os.path.splitext(CHART_FILES[target])[0] + '.' + args.format)
+    if target == 'llm':
+        LLMbar.plot_llm_chart(results, output_file)
+    else:
+        humanbar.plot_human_chart(results, output_file)
+
+
+def stage_score(args):
+    sentiment_score.score_sentiment(args.sentiment, args.agreement)
+
+
+def stage_repeats(args):
+    df = pd.read_csv(args.input, encoding='utf-8-sig').head(args.emoji_rows)
+    with _open_cache(args) as cache:
+        report = emoji_repeats.degeneration_report(df, get_model_columns(df), cache=cache)
+    report.to_csv(args.degeneration, index=False, encoding='utf-8-sig')
+    print(f"Degeneration report saved to '{args.degeneration}'")
+
+
+def stage_ngrams(args):
+    df = pd.read_csv(args.input, encoding='utf-8-sig').head(args.emoji_rows)
+    with _open_cache(args) as cache:
+        emoji_ngrams.build_emoji_index(df, cache=cache).save(args.ngram_index)
+    print(f"Emoji n-gram index saved to '{args.ngram_index}'")
+
+
+def stage_explorer(args):
+    export_explorer.export_explorer(args.combined, args.explorer_dir)
+
+
+def stage_site(args):
+    with _open_cache(args) as cache:
+        build_site.build_site(args.input, args.categories, args.sentiment, args.index_file,
+                              args.metrics, args.site_format, cache=cache, output_file=args.site_output,
+                              asset_dir=args.site_assets)
+
+
+def _stage_analyze_llm(args):
+    stage_analyze(args, 'llm')
+
+
+def _stage_analyze_human(args):
+    stage_analyze(args, 'human')
+
+
+def _stage_chart_llm(args):
+    stage_chart(args, 'llm')
+
+
+def _stage_chart_human(args):
+    stage_chart(args, 'human')
+
+
+# Stage name -> (function, dependencies), listed in dependency order
+PIPELINE = {
+    'combine': (stage_combine, []),
+    'score': (stage_score, []),
+    'analyze-llm': (_stage_analyze_llm, ['combine']),
+    'analyze-human': (_stage_analyze_human, ['combine']),
+    'repeats': (stage_repeats, ['combine']),
+    'ngrams': (stage_ngrams, ['combine']),
+    'explorer': (stage_explorer, ['combine']),
+    'chart-llm': (_stage_chart_llm, ['analyze-llm']),
+    'chart-human': (_stage_chart_human, ['analyze-human']),
+    'site': (stage_site, ['combine']),
+}
+
+
+def run_pipeline(args, stages=PIPELINE, skip=(), workers=None):
+    """Run the stages as a DAG; each stage starts as soon as its dependencies have finished"""
+    pending = {name: stage for name, stage in stages.items() if name not in skip}
+    done = set(skip)
+    failed = set()
+    running = {}
+    started = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            # Dependencies come first in `stages`, so one pass also skips whole failed chains
+            for name, (func, deps) in list(pending.items()):
+                if any(dep in failed for dep in deps):
+                    print(f"Skipping '{name}': a dependency failed")
+                    failed.add(name)
+                    del pending[name]
+                elif all(dep in done for dep in deps):
+                    print(f"Starting '{name}'")
+                    started[name] = time.perf_counter()
+                    running[pool.submit(func, args)] = name
+                    del pending[name]
+
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                elapsed = time.perf_counter() - started[name]
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"✗ '{name}' failed after {elapsed:.1f}s: {e}")
+                    failed.add(name)
+                else:
+                    print(f"✓ '{name}' finished in {elapsed:.1f}s")
+                    done.add(name)
+
+    return failed
+
+
+def stage_shards(args):
+    counts = prompt_sets.run_prompt_sets(args.prompt_sets, args.categories, args.workers,
+                                         args.emoji_rows, args.cache)
+    summary = prompt_sets.summarize(counts)
+    summary.to_csv(args.output, index=False, encoding='utf-8-sig')
+    print(f"\nSummary of {len(args.prompt_sets)} prompt sets saved to '{args.output}'")
+
+
+# ====== BENCH ======
+def _tokenize_all(responses):
+    return [extract_complete_emojis(response) for response in responses]
+
+
+def bench(args):
+    """Time tokenization, repeat detection and n-gram indexing on the corpus"""
+    df = pd.read_csv(args.input, encoding='utf-8-sig')
+    if args.emoji_rows is not None:
+        df = df.head(args.emoji_rows)
+    df = pd.concat([df] * args.scale, ignore_index=True)
+    columns = [col for col in df.columns if col != 'Question']
+    responses = [response for col in columns for response in df[col].dropna()]
+    tokens = _tokenize_all(responses)
+
+    def tokenize_parallel():
+        chunk = -(-len(responses) // args.workers)
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            list(pool.map(_tokenize_all, [responses[i:i + chunk] for i in range(0, len(responses), chunk)]))
+
+    cases = [
+        ('tokenize', lambda: _tokenize_all(responses)),
+        (f'tokenize ({args.workers} workers)', tokenize_parallel),
+        ('find_repeats', lambda: [emoji_repeats.find_repeats(t) for t in tokens]),
+        ('build_emoji_index', lambda: emoji_ngrams.build_emoji_index(df, columns)),
+    ]
+
+    with _open_cache(args) as cache:
+        if cache is not None:
+            # Warm the cache once so the timed runs measure hits only
+            for response in responses:
+                cache.tokenize(response)
+            cache.flush()
+            cases.append(('tokenize (cached)', lambda: [cache.tokenize(r) for r in responses]))
+
+        print(f"Benchmarking {len(responses)} responses ({args.scale}x corpus), best of {args.repeat}")
+        for name, func in cases:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                func()
+                timings.append(time.perf_counter() - start)
+            best = min(timings)
+            print(f"  {name:<28} {best * 1000:9.1f} ms  ({len(responses) / best:,.0f} responses/s)")
+
+
+# ====== ARGUMENTS ======
+def _add_combine_args(parser):
+    parser.add_argument('--human', default=ALLTO.HUMAN_CSV, help='human response CSV')
+    parser.add_argument('--llm-files', nargs='+', default=ALLTO.LLM_FILES, help='one CSV per model')
+    parser.add_argument('--combined', default=ALLTO.COMBINED_CSV, help='combined CSV (emojis + descriptions)')
+    parser.add_argument('--final', default=ALLTO.FINAL_CSV, help='final CSV (emoji-only first rows)')
+    parser.add_argument('--truncate-boilerplate', action='store_true',
+                        help='cut descriptions at "Let me know if..." style boilerplate')
+
+
+def _add_analyze_args(parser):
+    parser.add_argument('--categories', default=LLMbar.CATEGORIES_CSV, help='emoji categories CSV')
+    parser.add_argument('--collapse-repeats', action='store_true', help='collapse looping emoji runs first')
+    parser.add_argument('--detailed', default=LLMbar.DETAILED_CSV, help='not-in-category detail CSV')
+    parser.add_argument('--summary', default=LLMbar.SUMMARY_CSV, help='not-in-category summary CSV')
+
+
+def _add_cache_args(parser):
+    parser.add_argument('--cache', default=CACHE_FILE, help='tokenization cache file')
+    parser.add_argument('--no-cache', dest='cache', action='store_const', const=None,
+                        help='always tokenize, without reading or writing the cache')
+
+
+def _resolve_run_outputs(args):
+    """Place every output of `run` that was not given explicitly in --results-dir"""
+    os.makedirs(args.results_dir, exist_ok=True)
+    for dest, file_name in RUN_OUTPUTS.items():
+        if getattr(args, dest) is None:
+            if dest in SKIPPED_COMBINE_INPUTS and 'combine' in args.skip:
+                # Without the combine stage the tracked combined files are the inputs
+                setattr(args, dest, SKIPPED_COMBINE_INPUTS[dest])
+            else:
+                setattr(args, dest, os.path.join(args.results_dir, file_name))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Emoji and sentiment analysis pipeline')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    results_dir = argparse.ArgumentParser(add_help=False)
+    results_dir.add_argument('--results-dir', default='.', help='where analysis JSON and charts go')
+
+    combine_parser = subparsers.add_parser('combine', help='combine human and LLM responses')
+    _add_combine_args(combine_parser)
+    combine_parser.add_argument('--emoji-rows', type=int, default=10, help='number of emoji selection prompts')
+
+    analyze_parser = subparsers.add_parser('analyze', parents=[results_dir], help='count emoji categories')
+    analyze_parser.add_argument('target', nargs='?', choices=['llm', 'human', 'all'], default='all')
+    analyze_parser.add_argument('--input', default=LLMbar.RESPONSES_CSV, help='responses CSV')
+    analyze_parser.add_argument('--emoji-rows', type=int, default=None, help='only use the first N rows')
+    _add_analyze_args(analyze_parser)
+    _add_cache_args(analyze_parser)
+
+    chart_parser = subparsers.add_parser('chart', parents=[results_dir], help='plot the analyze results')
+    chart_parser.add_argument('target', nargs='?', choices=['llm', 'human', 'all'], default='all')
+    chart_parser.add_argument('--format', default='png', choices=['png', 'svg', 'webp', 'pdf'])
+
+    score_parser = subparsers.add_parser('score', help='sentiment agreement with the human labels')
+    score_parser.add_argument('--sentiment', default=sentiment_score.SENTIMENT_CSV, help='sentiment labels CSV')
+    score_parser.add_argument('--agreement', default=sentiment_score.AGREEMENT_CSV, help='output CSV')
+
+    bench_parser = subparsers.add_parser('bench', help='time the tokenization-heavy stages')
+    bench_parser.add_argument('--input', default=ALLTO.FINAL_CSV, help='responses CSV')
+    bench_parser.add_argument('--emoji-rows', type=int, default=10, help='only use the first N rows')
+    bench_parser.add_argument('--scale', type=int, default=1, help='repeat the corpus N times')
+    bench_parser.add_argument('--repeat', type=int, default=3, help='runs per case (best is reported)')
+    bench_parser.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes')
+    _add_cache_args(bench_parser)
+
+    shards_parser = subparsers.add_parser('shards', help='analyze many prompt sets in parallel')
+    shards_parser.add_argument('prompt_sets', nargs='+', help='one CSV per prompt set / language')
+    shards_parser.add_argument('--categories', default=LLMbar.CATEGORIES_CSV, help='emoji categories CSV')
+    shards_parser.add_argument('--emoji-rows', type=int, default=10, help='number of emoji selection prompts per set')
+    shards_parser.add_argument('--output', default=prompt_sets.SUMMARY_CSV, help='merged summary CSV')
+    shards_parser.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes')
+    _add_cache_args(shards_parser)
+
+    run_parser = subparsers.add_parser('run', parents=[results_dir], help='run every stage as a DAG')
+    _add_combine_args(run_parser)
+    _add_analyze_args(run_parser)
+    _add_cache_args(run_parser)
+    run_parser.add_argument('--emoji-rows', type=int, default=10, help='number of emoji selection prompts')
+    run_parser.add_argument('--sentiment', default=sentiment_score.SENTIMENT_CSV, help='sentiment labels CSV')
+    run_parser.add_argument('--agreement', default=sentiment_score.AGREEMENT_CSV, help='sentiment output CSV')
+    run_parser.add_argument('--degeneration', default='degeneration_by_model.csv', help='degeneration CSV')
+    run_parser.add_argument('--ngram-index', default='emoji_ngram_index.npz', help='n-gram index file')
+    run_parser.add_argument('--explorer-dir', default=export_explorer.EXPLORER_DIR, help='explorer chunks')
+    run_parser.add_argument('--index-file', default='index.html', help='page the generated Results go into')
+    run_parser.add_argument('--site-output', help='where the regenerated page is written')
+    run_parser.add_argument('--site-assets', help='charts too big to inline (default: next to the page)')
+    run_parser.add_argument('--metrics', default='results_metrics.json', help='aggregated metrics JSON')
+    run_parser.add_argument('--format', default='png', choices=['png', 'svg', 'webp', 'pdf'], help='chart format')
+    run_parser.add_argument('--site-format', default='svg', choices=['svg', 'webp'], help='Results page charts')
+    run_parser.add_argument('--workers', type=int, default=os.cpu_count(), help='stages run in parallel')
+    run_parser.add_argument('--skip', nargs='+', default=[], choices=list(PIPELINE), help='stages to skip')
+    # Outputs not given on the command line go into --results-dir (see _resolve_run_outputs)
+    run_parser.set_defaults(results_dir='results', **{dest: None for dest in RUN_OUTPUTS})
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.command == 'combine':
+        stage_combine(args)
+    elif args.command == 'analyze':
+        for target in _targets(args.target):
+            stage_analyze(args, target)
+    elif args.command == 'chart':
+        for target in _targets(args.target):
+            stage_chart(args, target)
+    elif args.command == 'score':
+        stage_score(args)
+    elif args.command == 'bench':
+        bench(args)
+    elif args.command == 'shards':
+        stage_shards(args)
+    elif args.command == 'run':
+        _resolve_run_outputs(args)
+        if args.cache:
+            # Create / version the cache file once before the stages open it
+            TokenCache(args.cache).close()
+        # Every stage after combine reads the final CSV
+        args.input = args.final
+        failed = run_pipeline(args, skip=args.skip, workers=args.workers)
+        return 1 if failed else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
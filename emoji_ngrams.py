@@ -0,0 +1,207 @@
+import numpy as np
+import pandas as pd
+from array import array
+from collections import Counter
+from itertools import combinations
+from scipy import sparse
+
+from emoji_tokens import EmojiVocab, tokenize
+
+
+# =============================================================================
+# Emoji co-occurrence and n-gram index
+# =============================================================================
+# Every (prompt, model) cell of the combined CSV is one "unit". Each unit is
+# tokenized once with extract_complete_emojis and that single token list feeds
+# the unigram, n-gram and co-occurrence counts. All counts are kept as CSR
+# matrices with one row per unit, so a per-model or per-prompt query is a row
+# selection + column sum instead of a rescan of the corpus.
+
+
+class _CsrBuilder:
+    """Append one row of {column: count} at a time and build a CSR matrix"""
+
+    def __init__(self):
+        self.indptr = array('q', [0])
+        self.indices = array('q')
+        self.data = array('I')
+
+    def add_row(self, counts):
+        for col in sorted(counts):
+            self.indices.append(col)
+            self.data.append(counts[col])
+        self.indptr.append(len(self.indices))
+
+    def build(self, n_cols, remap=None):
+        indices = np.frombuffer(self.indices, dtype=np.int64)
+        if remap is not None:
+            indices = remap(indices)
+        return sparse.csr_matrix(
+            (np.frombuffer(self.data, dtype=np.uint32),
+             indices,
+             np.frombuffer(self.indptr, dtype=np.int64)),
+            shape=(len(self.indptr) - 1, n_cols)
+        )
+
+
+def _column_totals(matrix, rows):
+    """Sum the selected rows of a CSR matrix, staying sparse (returns cols, counts)"""
+    if len(rows) == 0:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    selector = sparse.csr_matrix(np.ones((1, len(rows)), dtype=np.int64))
+    totals = (selector @ matrix[rows]).tocoo()
+    return totals.col.astype(np.int64), totals.data.astype(np.int64)
+
+
+class EmojiNgramIndex:
+    """Per-unit emoji unigram, n-gram and co-occurrence counts"""
+
+    def __init__(self, vocab, ngrams, models, prompts, unit_model, unit_prompt,
+                 unigram_counts, ngram_counts, pair_counts):
+        self.vocab = list(vocab)              # token id -> emoji sequence
+        self.ngrams = ngrams                  # ngram id -> token ids, padded with -1
+        self.models = list(models)
+        self.prompts = list(prompts)
+        self.unit_model = unit_model          # unit -> index into models
+        self.unit_prompt = unit_prompt        # unit -> index into prompts
+        self.unigram_counts = unigram_counts  # units x vocab
+        self.ngram_counts = ngram_counts      # units x ngrams
+        self.pair_counts = pair_counts        # units x (vocab * vocab), key a*V+b with a<b
+
+    # ====== QUERIES ======
+    def _rows(self, model=None, prompt=None):
+        mask = np.ones(len(self.unit_model), dtype=bool)
+        if model is not None:
+            mask &= self.unit_model == self.models.index(model)
+        if prompt is not None:
+            prompt_id = prompt if isinstance(prompt, (int, np.integer)) else self.prompts.index(prompt)
+            mask &= self.unit_prompt == prompt_id
+        return np.flatnonzero(mask)
+
+    def unigrams(self, k=10, model=None, prompt=None):
+        """Top-k single emoji sequences as [(sequence, count), ...]"""
+        cols, counts = _column_totals(self.unigram_counts, self._rows(model, prompt))
+        order = np.argsort(-counts, kind='stable')[:k]
+        return [(self.vocab[cols[i]], int(counts[i])) for i in order]
+
+    def top_ngrams(self, k=10, n=2, model=None, prompt=None):
+        """Top-k contiguous emoji n-grams as [(sequence, count), ...]"""
+        cols, counts = _column_totals(self.ngram_counts, self._rows(model, prompt))
+        lengths = (self.ngrams[cols] >= 0).sum(axis=1)
+        keep = lengths == n
+        cols, counts = cols[keep], counts[keep]
+        order = np.argsort(-counts, kind='stable')[:k]
+        return [(''.join(self.vocab[t] for t in self.ngrams[cols[i]] if t >= 0), int(counts[i]))
+                for i in order]
+
+    def cooccurrence(self, model=None, prompt=None):
+        """Upper-triangular vocab x vocab matrix of responses containing both emojis"""
+        size = len(self.vocab)
+        cols, counts = _column_totals(self.pair_counts, self._rows(model, prompt))
+        return sparse.coo_matrix((counts, (cols // size, cols % size)), shape=(size, size))
+
+    def top_pairs(self, k=10, model=None, prompt=None):
+        """Top-k co-occurring emoji pairs as [((first, second), count), ...]"""
+        matrix = self.cooccurrence(model, prompt)
+        order = np.argsort(-matrix.data, kind='stable')[:k]
+        return [((self.vocab[matrix.row[i]], self.vocab[matrix.col[i]]), int(matrix.data[i]))
+                for i in order]
+
+    # ====== STORAGE ======
+    def save(self, path):
+        arrays = {
+            'vocab': np.array(self.vocab, dtype=str),
+            'ngrams': self.ngrams,
+            'models': np.array(self.models, dtype=str),
+            'prompts': np.array(self.prompts, dtype=str),
+            'unit_model': self.unit_model,
+            'unit_prompt': self.unit_prompt,
+        }
+        for name in ['unigram_counts', 'ngram_counts', 'pair_counts']:
+            matrix = getattr(self, name)
+            arrays[f'{name}_data'] = matrix.data
+            arrays[f'{name}_indices'] = matrix.indices
+            arrays[f'{name}_indptr'] = matrix.indptr
+            arrays[f'{name}_shape'] = np.array(matrix.shape, dtype=np.int64)
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as f:
+            matrices = {
+                name: sparse.csr_matrix(
+                    (f[f'{name}_data'], f[f'{name}_indices'], f[f'{name}_indptr']),
+                    shape=tuple(f[f'{name}_shape'])
+                )
+                for name in ['unigram_counts', 'ngram_counts', 'pair_counts']
+            }
+            return cls(f['vocab'].tolist(), f['ngrams'], f['models'].tolist(),
+                       f['prompts'].tolist(), f['unit_model'], f['unit_prompt'], **matrices)
+
+
+def build_emoji_index(df, columns=None, prompt_col='Question', max_n=3, cache=None):
+    """Tokenize every (prompt, model) cell once and build an EmojiNgramIndex"""
+    if columns is None:
+        columns = [col for col in df.columns if col != prompt_col]
+
+    vocab = EmojiVocab()
+    ngram_ids = {}
+    unit_model = array('I')
+    unit_prompt = array('I')
+    unigram_rows = _CsrBuilder()
+    ngram_rows = _CsrBuilder()
+    # Pair keys are a << 32 | b while the vocab is still growing; this sorts the
+    # same as a * V + b, so the indices are remapped once V is known
+    pair_rows = _CsrBuilder()
+
+    prompts = df[prompt_col].astype(str).str.strip().tolist()
+
+    for model_idx, model_col in enumerate(columns):
+        for prompt_idx, response in enumerate(df[model_col]):
+            tokens = vocab.encode(tokenize(response, cache))
+
+            unit_model.append(model_idx)
+            unit_prompt.append(prompt_idx)
+            unigram_rows.add_row(Counter(tokens))
+
+            grams = Counter()
+            for n in range(2, max_n + 1):
+                for i in range(len(tokens) - n + 1):
+                    gram = tuple(tokens[i:i + n])
+                    grams[ngram_ids.setdefault(gram, len(ngram_ids))] += 1
+            ngram_rows.add_row(grams)
+
+            pair_rows.add_row({a << 32 | b: 1 for a, b in combinations(sorted(set(tokens)), 2)})
+
+    size = len(vocab)
+    pair_counts = pair_rows.build(size * size, remap=lambda keys: (keys >> 32) * size + (keys & 0xFFFFFFFF))
+
+    ngrams = np.full((len(ngram_ids), max_n), -1, dtype=np.int32)
+    for gram, gram_id in ngram_ids.items():
+        ngrams[gram_id, :len(gram)] = gram
+
+    return EmojiNgramIndex(
+        vocab=vocab.sequences,
+        ngrams=ngrams,
+        models=columns,
+        prompts=prompts,
+        unit_model=np.frombuffer(unit_model, dtype=np.uint32),
+        unit_prompt=np.frombuffer(unit_prompt, dtype=np.uint32),
+        unigram_counts=unigram_rows.build(size),
+        ngram_counts=ngram_rows.build(len(ngram_ids)),
+        pair_counts=pair_counts,
+    )
+
+
+if __name__ == '__main__':
+    # Only the first 10 prompts are emoji selection tasks
+    df = pd.read_csv('Human_response_final.csv', encoding='utf-8-sig').head(10)
+    index = build_emoji_index(df)
+    index.save('emoji_ngram_index.npz')
+    print(f"Index saved to 'emoji_ngram_index.npz' "
+          f"({len(index.vocab)} emoji sequences, {index.ngrams.shape[0]} n-grams)")
+
+    for model_col in index.models:
+        print(f"\n{model_col}")
+        print("  Top pairs:  " + ', '.join(f"{a}{b} ({c})" for (a, b), c in index.top_pairs(5, model=model_col)))
+        print("  Top 2-grams: " + ', '.join(f"{g} ({c})" for g, c in index.top_ngrams(5, n=2, model=model_col)))
@@ -0,0 +1,112 @@
+import pandas as pd
+
+from emoji_tokens import get_model_columns, tokenize
+
+
+# =============================================================================
+# Repetition / degeneration detector for looping model outputs
+# =============================================================================
+# Small models often loop on the same emoji run (💍❤️🎉💍❤️🎉...). A run is
+# "periodic" when a block of `period` emojis is repeated back to back. Blocks
+# are compared with a rolling (polynomial prefix) hash, so every comparison is
+# O(1) and a full scan is O(n * max_period) instead of quadratic.
+
+_HASH_MOD = (1 << 61) - 1
+_HASH_BASE = 1_000_003
+
+
+def _prefix_hashes(ids):
+    prefix = [0] * (len(ids) + 1)
+    powers = [1] * (len(ids) + 1)
+    for i, token_id in enumerate(ids):
+        prefix[i + 1] = (prefix[i] * _HASH_BASE + token_id + 1) % _HASH_MOD
+        powers[i + 1] = (powers[i] * _HASH_BASE) % _HASH_MOD
+    return prefix, powers
+
+
+def find_repeats(tokens, max_period=32, min_length=4):
+    """Find back-to-back repeated emoji blocks, returns [(start, period, copies), ...]"""
+    interned = {}
+    ids = [interned.setdefault(token, len(interned)) for token in tokens]
+    prefix, powers = _prefix_hashes(ids)
+
+    def block(start, end):
+        return (prefix[end] - prefix[start] * powers[end - start]) % _HASH_MOD
+
+    repeats = []
+    n = len(ids)
+    i = 0
+    while i < n:
+        # Try the smallest period first so 🎉🎉🎉🎉 is one run of period 1
+        for period in range(1, min(max_period, (n - i) // 2) + 1):
+            first = block(i, i + period)
+            if first != block(i + period, i + 2 * period) or ids[i:i + period] != ids[i + period:i + 2 * period]:
+                continue
+
+            copies = 2
+            while i + (copies + 1) * period <= n and block(i + copies * period, i + (copies + 1) * period) == first:
+                copies += 1
+
+            if period * copies >= min_length:
+                repeats.append((i, period, copies))
+                i += period * copies
+                break
+        else:
+            i += 1
+
+    return repeats
+
+
+def collapse_repeats(tokens, max_period=32, min_length=4):
+    """Keep a single copy of every repeated block found by find_repeats"""
+    collapsed = []
+    i = 0
+    for start, period, copies in find_repeats(tokens, max_period, min_length):
+        collapsed.extend(tokens[i:start + period])
+        i = start + period * copies
+    collapsed.extend(tokens[i:])
+    return collapsed
+
+
+def update_degeneration_counts(counts, emoji_sequences, max_period=32, min_length=4):
+    """Add one response to counts['responses'], ['degenerate'], ['total_emojis'] and ['repeated_emojis']"""
+    repeats = find_repeats(emoji_sequences, max_period, min_length)
+    counts['responses'] += 1
+    counts['total_emojis'] += len(emoji_sequences)
+    if repeats:
+        counts['degenerate'] += 1
+        counts['repeated_emojis'] += sum(period * (copies - 1) for _, period, copies in repeats)
+    return counts
+
+
+def degeneration_report(df, columns, max_period=32, min_length=4, cache=None):
+    """Per-model share of responses that contain at least one repeated block"""
+    records = []
+    for model_col in columns:
+        counts = {'responses': 0, 'degenerate': 0, 'total_emojis': 0, 'repeated_emojis': 0}
+        for response in df[model_col].dropna():
+            update_degeneration_counts(counts, tokenize(response, cache), max_period, min_length)
+
+        records.append({
+            'Model': model_col,
+            'Responses': counts['responses'],
+            'Degenerate_Responses': counts['degenerate'],
+            'Degeneration_Rate': counts['degenerate'] / counts['responses'] if counts['responses'] else 0.0,
+            'Total_Emojis': counts['total_emojis'],
+            'Repeated_Emojis': counts['repeated_emojis'],
+        })
+
+    return pd.DataFrame(records)
+
+
+if __name__ == '__main__':
+    # Only the first 10 prompts are emoji selection tasks
+    df = pd.read_csv('Human_response_final.csv', encoding='utf-8-sig').head(10)
+    report = degeneration_report(df, get_model_columns(df))
+    report.to_csv('degeneration_by_model.csv', index=False, encoding='utf-8-sig')
+
+    print("Degeneration rate per model:")
+    for _, row in report.iterrows():
+        print(f"  {row['Model']}: {row['Degeneration_Rate']:.0%} of responses "
+              f"({row['Repeated_Emojis']} repeated emojis)")
+    print(f"\nReport saved to 'degeneration_by_model.csv'")
@@ -0,0 +1,202 @@
+import re
+import pandas as pd
+import emoji
+from array import array
+
+
+# Skin tone modifiers (🏻🏼🏽🏾🏿)
+SKIN_TONES = ['🏻', '🏼', '🏽', '🏾', '🏿']
+
+
+# Columns of the response CSVs that are not model responses
+NON_MODEL_COLUMNS = ['Question', 'Human Response']
+
+
+# Model response columns of a combined / final responses DataFrame
+def get_model_columns(df):
+    """Every column except the prompt and the human response"""
+    return [col for col in df.columns if col not in NON_MODEL_COLUMNS]
+
+
+# Function to extract complete emoji sequences (including skin tones as part of emoji)
+def extract_complete_emojis(text):
+    """Extract emoji sequences, treating skin tones and ZWJ sequences as single emojis"""
+    if pd.isna(text):
+        return []
+
+    text_str = str(text)
+    emoji_sequences = []
+    i = 0
+
+    while i < len(text_str):
+        char = text_str[i]
+
+        # Check if current character is a base emoji
+        if char in emoji.EMOJI_DATA:
+            # Start building a sequence
+            sequence = char
+            i += 1
+
+            # Look ahead for skin tones or ZWJ sequences
+            while i < len(text_str):
+                next_char = text_str[i]
+
+                # Skin tone modifier (🏻🏼🏽🏾🏿)
+                if next_char in SKIN_TONES:
+                    sequence += next_char
+                    i += 1
+                # Zero-width joiner (for complex emojis like 🙇🏻‍♀️)
+                elif next_char == '\u200d' and i + 1 < len(text_str):
+                    # Check if next character after ZWJ is also an emoji
+                    if text_str[i + 1] in emoji.EMOJI_DATA:
+                        sequence += next_char + text_str[i + 1]
+                        i += 2
+                    else:
+                        break
+                # Variation selector (makes emoji colorful vs black/white)
+                elif next_char == '\ufe0f':
+                    sequence += next_char
+                    i += 1
+                else:
+                    break
+
+            emoji_sequences.append(sequence)
+        else:
+            i += 1
+
+    return emoji_sequences
+
+
+# Regex character class of every single-character emoji in emoji.EMOJI_DATA
+def _emoji_char_class():
+    codepoints = sorted(ord(e) for e in emoji.EMOJI_DATA if len(e) == 1)
+    ranges = []
+    for cp in codepoints:
+        if ranges and cp == ranges[-1][1] + 1:
+            ranges[-1][1] = cp
+        else:
+            ranges.append([cp, cp])
+    return '[' + ''.join(re.escape(chr(lo)) + ('-' + re.escape(chr(hi)) if hi > lo else '')
+                         for lo, hi in ranges) + ']'
+
+
+# Regex matching the same sequences as extract_complete_emojis: a base emoji
+# followed by skin tones, variation selectors and ZWJ-joined emojis
+EMOJI_CHAR = _emoji_char_class()
+EMOJI_SEQUENCE = EMOJI_CHAR + '(?:[' + ''.join(SKIN_TONES) + '\ufe0f]|\u200d' + EMOJI_CHAR + ')*'
+
+
+# Function to get base emoji (remove skin tones and modifiers for comparison)
+def get_base_emoji(emoji_sequence):
+    """Extract just the base emoji character from a sequence"""
+    if not emoji_sequence:
+        return ''
+
+    # Remove skin tones
+    base = emoji_sequence
+    for tone in SKIN_TONES:
+        base = base.replace(tone, '')
+
+    # Remove variation selector
+    base = base.replace('\ufe0f', '')
+
+    # For ZWJ sequences, take the first emoji component
+    if '\u200d' in base:
+        # Take everything before ZWJ or first character
+        parts = base.split('\u200d')
+        if parts[0]:
+            return parts[0]
+        elif len(parts) > 1 and parts[1]:
+            return parts[1][0] if parts[1] else ''
+
+    # Return first character (should be the base emoji)
+    return base[0] if base else ''
+
+
+# Tokenize through a TokenCache (token_cache.py) when one is given
+def tokenize(text, cache=None):
+    """extract_complete_emojis(text), served from the cache when possible"""
+    if cache is None:
+        return extract_complete_emojis(text)
+    return cache.tokenize(text)
+
+
+class EmojiVocab:
+    """Interned emoji sequences: each distinct sequence is stored once and referred to by an int id
+
+    Base emojis (see get_base_emoji) live in their own table, so the sequence ids
+    only cover sequences that actually occur in the data
+    """
+    __slots__ = ('ids', 'sequences', 'base_ids', 'bases', 'base_index')
+
+    def __init__(self):
+        self.ids = {}               # emoji sequence -> id
+        self.sequences = []         # id -> emoji sequence
+        self.base_ids = array('I')  # id -> index of its base emoji in bases
+        self.bases = []             # base index -> base emoji
+        self.base_index = {}        # base emoji -> base index
+
+    def __len__(self):
+        return len(self.sequences)
+
+    def __getitem__(self, token_id):
+        return self.sequences[token_id]
+
+    def intern(self, emoji_sequence):
+        token_id = self.ids.get(emoji_sequence)
+        if token_id is None:
+            token_id = len(self.sequences)
+            self.ids[emoji_sequence] = token_id
+            self.sequences.append(emoji_sequence)
+
+            base_emoji = get_base_emoji(emoji_sequence)
+            base_id = self.base_index.get(base_emoji)
+            if base_id is None:
+                base_id = len(self.bases)
+                self.base_index[base_emoji] = base_id
+                self.bases.append(base_emoji)
+            self.base_ids.append(base_id)
+        return token_id
+
+    def encode(self, emoji_sequences):
+        """Token ids of a list of emoji sequences as a compact array('I')"""
+        return array('I', [self.intern(e) for e in emoji_sequences])
+
+    def base(self, token_id):
+        return self.bases[self.base_ids[token_id]]
+
+
+# Load the Emotion / Non-emotion category emoji lists (first row of emoji_categories.csv)
+def load_category_sets(categories_csv):
+    """Return (emotion_sequences, concrete_sequences, emotion_base_set, concrete_base_set)"""
+    emoji_categories_df = pd.read_csv(categories_csv, encoding='utf-8-sig')
+    emotion_categories = extract_complete_emojis(emoji_categories_df.iloc[0, 0])
+    concrete_categories = extract_complete_emojis(emoji_categories_df.iloc[0, 1])
+
+    emotion_base_set = {get_base_emoji(e) for e in emotion_categories if get_base_emoji(e)}
+    concrete_base_set = {get_base_emoji(e) for e in concrete_categories if get_base_emoji(e)}
+    return emotion_categories, concrete_categories, emotion_base_set, concrete_base_set
+
+
+# Add one response's emojis to running category counts
+def update_category_counts(counts, emoji_sequences, emotion_base_set, concrete_base_set):
+    """Add to counts['total'], counts['emotion'], counts['concrete'] and counts['other']"""
+    for emoji_seq in emoji_sequences:
+        base_emoji = get_base_emoji(emoji_seq)
+        counts['total'] += 1
+        if base_emoji in emotion_base_set:
+            counts['emotion'] += 1
+        elif base_emoji in concrete_base_set:
+            counts['concrete'] += 1
+        else:
+            counts['other'] += 1
+    return counts
+
+
+# Count how many emojis in a column of responses fall in each category
+def count_categories(responses, emotion_base_set, concrete_base_set, cache=None):
+    """Return {'total', 'emotion', 'concrete', 'other'} emoji counts"""
+    counts = {'total': 0, 'emotion': 0, 'concrete': 0, 'other': 0}
+    for response in responses:
+        update_category_counts(counts, tokenize(response, cache), emotion_base_set, concrete_base_set)
+    return counts
@@ -0,0 +1,85 @@
+import glob
+import gzip
+import json
+import os
+
+import pandas as pd
+
+
+# =============================================================================
+# Chunked export of the combined table for the in-page data explorer
+# =============================================================================
+# The explorer in index.html never downloads the whole table. It reads
+# explorer/manifest.json, which lists every (model, prompt) group with its row
+# range, and fetches only the gzip'd JSON chunks covering the rows on screen.
+# Rows are sorted by model then prompt so a filtered view touches few chunks.
+
+COMBINED_CSV = 'Humancombined.csv'
+EXPLORER_DIR = 'explorer'
+CHUNK_ROWS = 2000
+
+
+def to_long_format(df, prompt_col='Question'):
+    """Turn the wide CSV (one column per model) into (prompt, model, response) rows"""
+    long_df = df.melt(id_vars=[prompt_col], var_name='model', value_name='response')
+    long_df = long_df.rename(columns={prompt_col: 'prompt'}).dropna(subset=['response'])
+    long_df['prompt'] = long_df['prompt'].astype(str).str.strip()
+    return long_df
+
+
+def export_explorer(csv_file=COMBINED_CSV, out_dir=EXPLORER_DIR, chunk_rows=CHUNK_ROWS,
+                    prompt_col='Question'):
+    """Write manifest.json and chunk-NNNNN.json.gz files for the explorer"""
+    long_df = to_long_format(pd.read_csv(csv_file, encoding='utf-8-sig'), prompt_col)
+
+    models = list(dict.fromkeys(long_df['model']))
+    prompts = list(dict.fromkeys(long_df['prompt']))
+    model_ids = {name: i for i, name in enumerate(models)}
+    prompt_ids = {text: i for i, text in enumerate(prompts)}
+
+    long_df['model_id'] = long_df['model'].map(model_ids)
+    long_df['prompt_id'] = long_df['prompt'].map(prompt_ids)
+    long_df = long_df.sort_values(['model_id', 'prompt_id'], kind='stable')
+
+    rows = list(zip(long_df['prompt_id'].tolist(), long_df['model_id'].tolist(),
+                    long_df['response'].astype(str).tolist()))
+
+    # Consecutive rows with the same (model, prompt) form one group
+    groups = []
+    for start, (prompt_id, model_id, _) in enumerate(rows):
+        if groups and groups[-1][0] == model_id and groups[-1][1] == prompt_id:
+            groups[-1][3] += 1
+        else:
+            groups.append([model_id, prompt_id, start, 1])
+
+    os.makedirs(out_dir, exist_ok=True)
+    for old_chunk in glob.glob(os.path.join(out_dir, 'chunk-*.json.gz')):
+        os.remove(old_chunk)
+
+    chunks = []
+    for chunk_no, start in enumerate(range(0, len(rows), chunk_rows)):
+        name = f'chunk-{chunk_no:05d}.json.gz'
+        payload = json.dumps(rows[start:start + chunk_rows], ensure_ascii=False, separators=(',', ':'))
+        with open(os.path.join(out_dir, name), 'wb') as f:
+            f.write(gzip.compress(payload.encode('utf-8'), mtime=0))
+        chunks.append(name)
+
+    manifest = {
+        'source': os.path.basename(csv_file),
+        'total_rows': len(rows),
+        'chunk_rows': chunk_rows,
+        'chunks': chunks,
+        'models': models,
+        'prompts': prompts,
+        'groups': groups,  # [model_id, prompt_id, first_row, row_count]
+    }
+    with open(os.path.join(out_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, separators=(',', ':'))
+
+    return manifest
+
+
+if __name__ == '__main__':
+    manifest = export_explorer()
+    print(f"Explorer data saved to '{EXPLORER_DIR}/': {manifest['total_rows']} rows "
+          f"in {len(manifest['chunks'])} chunks")
@@ -0,0 +1,119 @@
+import glob
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from emoji_tokens import get_model_columns, load_category_sets, tokenize, update_category_counts
+from emoji_repeats import update_degeneration_counts
+from token_cache import TokenCache
+
+
+# =============================================================================
+# Sharded analysis over many prompt sets / languages
+# =============================================================================
+# Every prompt set is a CSV laid out like Human_response_final.csv (a Question
+# column plus one column per responder) and is analyzed as an independent
+# shard in a worker process. Shards only produce counts, and merge_counts()
+# is associative (Counter addition), so the shard results can be reduced in
+# any order as they complete and runtime scales with the number of cores.
+# Shards are keyed by their path, so en/prompts.csv and fr/prompts.csv stay
+# apart.
+
+SUMMARY_CSV = 'prompt_set_summary.csv'
+
+
+def empty_counts():
+    return {'categories': {}, 'emojis': {}, 'degeneration': {}, 'per_shard': {}}
+
+
+def merge_counts(total, shard):
+    """Add a shard result into total in place and return it; shards can be merged in any order"""
+    for key in ['categories', 'emojis', 'degeneration']:
+        for model, counts in shard[key].items():
+            total[key].setdefault(model, Counter()).update(counts)
+    total['per_shard'].update(shard['per_shard'])
+    return total
+
+
+def analyze_shard(path, emotion_base_set, concrete_base_set, emoji_rows=10, cache_path=None):
+    """Tokenize and count one prompt set; returns the structure used by merge_counts"""
+    df = pd.read_csv(path, encoding='utf-8-sig')
+    if emoji_rows is not None:
+        # Only the first emoji_rows prompts are emoji selection tasks
+        df = df.head(emoji_rows)
+    columns = get_model_columns(df)
+
+    counts = empty_counts()
+    cache = TokenCache(cache_path) if cache_path else None
+    try:
+        for model_col in columns:
+            categories = Counter()
+            emojis = Counter()
+            degeneration = Counter()
+
+            # Tokenize once and feed the same counters analyze / site use
+            for response in df[model_col].dropna():
+                emoji_sequences = tokenize(response, cache)
+                emojis.update(emoji_sequences)
+                update_category_counts(categories, emoji_sequences, emotion_base_set, concrete_base_set)
+                update_degeneration_counts(degeneration, emoji_sequences)
+
+            counts['categories'][model_col] = categories
+            counts['emojis'][model_col] = emojis
+            counts['degeneration'][model_col] = degeneration
+    finally:
+        if cache is not None:
+            cache.close()
+
+    counts['per_shard'][path] = {model: dict(c) for model, c in counts['categories'].items()}
+    return counts
+
+
+def run_prompt_sets(paths, categories_csv='emoji_categories.csv', workers=None, emoji_rows=10,
+                    cache_path=None):
+    """Analyze every prompt set CSV in parallel and reduce the results into one count structure"""
+    _, _, emotion_base_set, concrete_base_set = load_category_sets(categories_csv)
+
+    if cache_path:
+        # Create / version the cache file once before the workers open it
+        TokenCache(cache_path).close()
+
+    total = empty_counts()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(analyze_shard, path, emotion_base_set, concrete_base_set, emoji_rows, cache_path): path
+            for path in paths
+        }
+        for future in as_completed(futures):
+            total = merge_counts(total, future.result())
+            print(f"Merged prompt set '{futures[future]}'")
+    return total
+
+
+def summarize(counts):
+    """One row per model with the merged category counts and degeneration rate"""
+    records = []
+    for model in sorted(counts['categories']):
+        categories = counts['categories'][model]
+        degeneration = counts['degeneration'][model]
+        records.append({
+            'Model': model,
+            'Prompt_Sets': sum(model in shard for shard in counts['per_shard'].values()),
+            'Total_Emojis': categories['total'],
+            'Emotion': categories['emotion'],
+            'Non_Emotion': categories['concrete'],
+            'Other': categories['other'],
+            'Distinct_Emojis': len(counts['emojis'][model]),
+            'Degeneration_Rate': (degeneration['degenerate'] / degeneration['responses']
+                                  if degeneration['responses'] else 0.0),
+        })
+    return pd.DataFrame(records)
+
+
+if __name__ == '__main__':
+    paths = sorted(glob.glob(os.path.join('prompt_sets', '*.csv'))) or ['Human_response_final.csv']
+    summary = summarize(run_prompt_sets(paths))
+    summary.to_csv(SUMMARY_CSV, index=False, encoding='utf-8-sig')
+    print(f"\nSummary of {len(paths)} prompt sets saved to '{SUMMARY_CSV}'")
@@ -0,0 +1,45 @@
+import string
+
+import pandas as pd
+
+
+# Default input / output files
+SENTIMENT_CSV = '11-20.csv'
+AGREEMENT_CSV = 'sentiment_agreement.csv'
+
+
+def load_sentiment_labels(sentiment_csv=SENTIMENT_CSV):
+    """Return (sentences, labels) with labels normalized to lower case ("positive ", " Positive." -> "positive")"""
+    sentiment_df = pd.read_csv(sentiment_csv, encoding='utf-8-sig', skipinitialspace=True)
+    sentiment_df.columns = [col.strip() for col in sentiment_df.columns]
+
+    # The sentence to classify follows the prompt's "...for the result:" prefix
+    sentences = [question.split(':', 1)[-1].strip() for question in sentiment_df['Question'].astype(str)]
+    labels = sentiment_df.drop(columns=['Question']).apply(
+        lambda col: col.astype(str).str.strip().str.rstrip(string.punctuation).str.lower())
+    return sentences, labels
+
+
+def sentiment_agreement(labels):
+    """Share of sentences where each model's label matches the human label"""
+    models = [col for col in labels.columns if col != 'Human Response']
+    return {model: float((labels[model] == labels['Human Response']).mean()) for model in models}
+
+
+def score_sentiment(sentiment_csv=SENTIMENT_CSV, output_csv=AGREEMENT_CSV):
+    """Write the per-model agreement with the human sentiment label to output_csv"""
+    _, labels = load_sentiment_labels(sentiment_csv)
+    agreement = sentiment_agreement(labels)
+
+    agreement_df = pd.DataFrame({'Model': list(agreement), 'Agreement': list(agreement.values())})
+    agreement_df.to_csv(output_csv, index=False, encoding='utf-8-sig')
+
+    print("Agreement with the human sentiment label:")
+    for model, share in agreement.items():
+        print(f"  {model}: {share:.0%}")
+    print(f"\nAgreement saved to '{output_csv}'")
+    return agreement
+
+
+if __name__ == '__main__':
+    score_sentiment()
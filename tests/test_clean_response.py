@@ -0,0 +1,48 @@
+import time
+
+import pytest
+
+from ALLTO import clean_response, extract_emojis_and_description
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('🎉 - party', ('🎉', 'party')),
+    (': - 🎉 party', ('🎉', 'party')),
+    ('**Happy**   face', ('', 'Happy face')),
+    ('- a\n- b', ('', 'a b')),
+    ('1. first\n2. second\n  - nested', ('', 'first second nested')),
+    ('-5 degrees', ('', '-5 degrees')),
+    ('a * b', ('', 'a * b')),
+    ('Answer: yes', ('', 'Answer: yes')),
+    ('我很高兴 🎉', ('🎉', '我很高兴')),
+    ('👰‍♀️ bride', ('👰‍♀️', 'bride')),
+    ('text ‍‍‍ (😊) more', ('😊', 'text more')),
+    ('I love 🇺🇸 flag', ('🇺🇸', 'I love flag')),
+    ('Bonjour (🇫🇷)', ('🇫🇷', 'Bonjour')),
+])
+def test_clean_response(text, expected):
+    assert clean_response(text) == expected
+
+
+def test_truncate_boilerplate_keeps_later_emojis():
+    text = '🎉 Congrats! To help me narrow it down, tell me more 😊'
+    assert clean_response(text) == ('🎉😊', 'Congrats! To help me narrow it down, tell me more')
+    assert clean_response(text, truncate_boilerplate=True) == ('🎉😊', 'Congrats!')
+
+
+def test_extract_emojis_and_description():
+    assert extract_emojis_and_description('🎉 - party') == '🎉 - party'
+    assert extract_emojis_and_description('🎉') == '🎉'
+    assert extract_emojis_and_description(float('nan')) == ''
+
+
+@pytest.mark.parametrize('prefix, run, suffix', [
+    ('(', '👰‍♀️' * 11, ' bride'),
+    ('Family (', '👨‍👩‍👧‍👦' * 7, ''),
+])
+def test_unclosed_parenthesis_before_emoji_run_is_fast(prefix, run, suffix):
+    # The "()" rule used to backtrack exponentially in the length of the run (over 1 s for these)
+    start = time.perf_counter()
+    emojis, _ = clean_response(prefix + run + suffix)
+    assert time.perf_counter() - start < 0.5
+    assert emojis == run
@@ -0,0 +1,79 @@
+from collections import Counter
+from itertools import combinations
+
+import pandas as pd
+import pytest
+
+from emoji_ngrams import EmojiNgramIndex, build_emoji_index
+from emoji_tokens import extract_complete_emojis
+
+
+DF = pd.DataFrame({
+    'Question': ['wedding', 'birthday', 'exam'],
+    'model-a': ['💍❤️🎉💍❤️🎉 yay', '🎂🎉🎂', None],
+    'model-b': ['👰‍♀️🤵💍', '🎉🎉🎉 party', '😢📚😢📚'],
+})
+MODELS = ['model-a', 'model-b']
+
+
+def _cells(model=None, prompt=None):
+    for model_col in MODELS:
+        for prompt_idx, response in enumerate(DF[model_col]):
+            if model in (None, model_col) and prompt in (None, prompt_idx):
+                yield extract_complete_emojis(response)
+
+
+def _expected_unigrams(**where):
+    return sum((Counter(tokens) for tokens in _cells(**where)), Counter())
+
+
+def _expected_ngrams(n, **where):
+    return sum((Counter(''.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+                for tokens in _cells(**where)), Counter())
+
+
+def _expected_pairs(**where):
+    return sum((Counter(frozenset(pair) for pair in combinations(set(tokens), 2))
+                for tokens in _cells(**where)), Counter())
+
+
+@pytest.fixture(scope='module')
+def index():
+    return build_emoji_index(DF, MODELS)
+
+
+WHERE = [{}, {'model': 'model-a'}, {'model': 'model-b'}, {'prompt': 0}, {'prompt': 'exam'},
+         {'model': 'model-a', 'prompt': 2}]
+
+
+@pytest.mark.parametrize('where', WHERE)
+def test_counts_match_brute_force(index, where):
+    brute_where = dict(where)
+    if isinstance(brute_where.get('prompt'), str):
+        brute_where['prompt'] = index.prompts.index(brute_where['prompt'])
+
+    assert dict(index.unigrams(k=100, **where)) == _expected_unigrams(**brute_where)
+    for n in (2, 3):
+        assert dict(index.top_ngrams(k=100, n=n, **where)) == _expected_ngrams(n, **brute_where)
+    pairs = {frozenset(pair): count for pair, count in index.top_pairs(k=100, **where)}
+    assert pairs == _expected_pairs(**brute_where)
+
+
+def test_top_k_is_sorted(index):
+    counts = [count for _, count in index.unigrams(k=3)]
+    assert counts == sorted(counts, reverse=True)
+    assert index.unigrams(k=1) == [('🎉', 6)]
+
+
+def test_save_load_round_trip(index, tmp_path):
+    path = tmp_path / 'index.npz'
+    index.save(path)
+    loaded = EmojiNgramIndex.load(path)
+
+    assert loaded.vocab == index.vocab
+    assert loaded.models == index.models
+    assert loaded.prompts == index.prompts
+    for where in WHERE:
+        assert loaded.unigrams(k=100, **where) == index.unigrams(k=100, **where)
+        assert loaded.top_ngrams(k=100, n=3, **where) == index.top_ngrams(k=100, n=3, **where)
+        assert loaded.top_pairs(k=100, **where) == index.top_pairs(k=100, **where)
@@ -0,0 +1,28 @@
+from emoji_repeats import collapse_repeats, find_repeats
+
+
+def test_single_emoji_run_is_period_one():
+    assert find_repeats(list('aaaab')) == [(0, 1, 4)]
+
+
+def test_block_repeat():
+    tokens = ['💍', '❤️', '🎉'] * 3 + ['😊']
+    assert find_repeats(tokens) == [(0, 3, 3)]
+    assert collapse_repeats(tokens) == ['💍', '❤️', '🎉', '😊']
+
+
+def test_short_runs_are_ignored():
+    assert find_repeats(list('aab')) == []
+    assert find_repeats(list('abab')) == [(0, 2, 2)]
+    assert find_repeats(list('abab'), min_length=5) == []
+
+
+def test_repeat_after_prefix():
+    tokens = list('xyabababz')
+    assert find_repeats(tokens) == [(2, 2, 3)]
+    assert collapse_repeats(tokens) == list('xyabz')
+
+
+def test_empty_and_no_repeats():
+    assert find_repeats([]) == []
+    assert collapse_repeats(list('abc')) == list('abc')
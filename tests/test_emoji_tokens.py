@@ -0,0 +1,31 @@
+import re
+
+import pandas as pd
+
+from emoji_tokens import EMOJI_SEQUENCE, EmojiVocab, extract_complete_emojis, get_model_columns
+
+
+def test_model_columns_skip_prompt_and_human():
+    df = pd.DataFrame(columns=['Question', 'Human Response', 'Qwen2.5-7B', 'gemma-3-1b'])
+    assert get_model_columns(df) == ['Qwen2.5-7B', 'gemma-3-1b']
+
+
+def test_vocab_interns_each_sequence_once():
+    vocab = EmojiVocab()
+    ids = vocab.encode(['❤️', '😀', '❤️'])
+    assert list(ids) == [0, 1, 0]
+    assert vocab[0] == '❤️'
+    assert len(vocab) == 2
+
+
+def test_vocab_bases_do_not_enter_the_sequence_ids():
+    vocab = EmojiVocab()
+    ids = vocab.encode(['❤️', '👰‍♀️'])
+    assert vocab.sequences == ['❤️', '👰‍♀️']
+    assert [vocab.base(token_id) for token_id in ids] == ['❤', '👰']
+
+
+def test_emoji_sequence_regex_matches_the_tokenizer():
+    pattern = re.compile(EMOJI_SEQUENCE)
+    for text in ['👰‍♀️ bride', '🙇🏻‍♀️🎉', '❤️‍', '我很高兴 🎉', 'a‍b', '👍🏽👍']:
+        assert pattern.findall(text) == extract_complete_emojis(text)
@@ -0,0 +1,65 @@
+from collections import Counter
+
+import pandas as pd
+
+from emoji_repeats import degeneration_report
+from emoji_tokens import count_categories
+from prompt_sets import analyze_shard, empty_counts, merge_counts, summarize
+
+
+def _shard(path, model, emotion, other, emojis):
+    counts = empty_counts()
+    counts['categories'][model] = Counter(total=emotion + other, emotion=emotion, other=other)
+    counts['emojis'][model] = Counter(emojis)
+    counts['degeneration'][model] = Counter(responses=1)
+    counts['per_shard'][path] = {model: dict(counts['categories'][model])}
+    return counts
+
+
+def test_merge_is_order_independent():
+    shards = [
+        _shard('en/prompts.csv', 'gemma-3-1b', 2, 1, '😀😀🎉'),
+        _shard('fr/prompts.csv', 'gemma-3-1b', 1, 0, '😀'),
+        _shard('fr/other.csv', 'Yi-1.5-6B', 0, 2, '🎉🎉'),
+    ]
+    forward = empty_counts()
+    for shard in shards:
+        merge_counts(forward, shard)
+    backward = empty_counts()
+    for shard in reversed(shards):
+        merge_counts(backward, shard)
+
+    assert forward == backward
+    assert forward['categories']['gemma-3-1b'] == Counter(total=4, emotion=3, other=1)
+    assert forward['emojis']['gemma-3-1b'] == Counter({'😀': 3, '🎉': 1})
+
+
+def test_same_file_name_in_different_directories_is_two_prompt_sets():
+    total = empty_counts()
+    merge_counts(total, _shard('en/prompts.csv', 'gemma-3-1b', 1, 0, '😀'))
+    merge_counts(total, _shard('fr/prompts.csv', 'gemma-3-1b', 1, 0, '😀'))
+    summary = summarize(total).set_index('Model')
+    assert summary.loc['gemma-3-1b', 'Prompt_Sets'] == 2
+    assert summary.loc['gemma-3-1b', 'Total_Emojis'] == 2
+
+
+def test_shard_counts_match_analyze_and_site(tmp_path):
+    df = pd.DataFrame({
+        'Question': ['q1', 'q2', 'q3'],
+        'Human Response': ['😀', '🎉', '😢'],
+        'gemma-3-1b': ['😀😀🎉🎉😀😀🎉🎉', '🐶 dog', None],
+        'Yi-1.5-6B': ['😢', '☕☕☕☕', '🤯 wow'],
+    })
+    path = str(tmp_path / 'prompts.csv')
+    df.to_csv(path, index=False)
+    emotion, concrete = {'😀', '😢', '🤯'}, {'🎉', '🐶'}
+
+    counts = analyze_shard(path, emotion, concrete)
+    degeneration = degeneration_report(df, ['gemma-3-1b', 'Yi-1.5-6B']).set_index('Model')
+
+    assert set(counts['categories']) == {'gemma-3-1b', 'Yi-1.5-6B'}
+    for model in ['gemma-3-1b', 'Yi-1.5-6B']:
+        expected = count_categories(df[model].dropna(), emotion, concrete)
+        assert {key: counts['categories'][model][key] for key in expected} == expected
+        assert counts['degeneration'][model]['responses'] == degeneration.loc[model, 'Responses']
+        assert counts['degeneration'][model]['degenerate'] == degeneration.loc[model, 'Degenerate_Responses']
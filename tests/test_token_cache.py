@@ -0,0 +1,103 @@
+import multiprocessing
+import random
+
+import emoji
+import pytest
+
+import token_cache
+from emoji_tokens import extract_complete_emojis
+from token_cache import TokenCache
+
+
+def test_hits_return_the_tokenizer_result(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    texts = ['👰‍♀️ bride', '🎉🎉 party', 'no emojis', '🙇🏻‍♀️']
+    with TokenCache(path) as cache:
+        assert [cache.tokenize(t) for t in texts] == [extract_complete_emojis(t) for t in texts]
+        assert cache.misses == len(texts)
+
+    with TokenCache(path) as cache:
+        assert [cache.tokenize(t) for t in texts] == [extract_complete_emojis(t) for t in texts]
+        assert (cache.hits, cache.misses) == (len(texts), 0)
+
+
+def test_repeated_text_is_not_tokenized_again_before_flush(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(token_cache, 'extract_complete_emojis',
+                        lambda text: calls.append(text) or extract_complete_emojis(text))
+    with TokenCache(str(tmp_path / 'cache.sqlite')) as cache:
+        assert cache.tokenize('🎉 a') == cache.tokenize('🎉 a') == ['🎉']
+    assert calls == ['🎉 a']
+
+
+def test_hits_are_flushed_in_batches(tmp_path, monkeypatch):
+    path = str(tmp_path / 'cache.sqlite')
+    with TokenCache(path) as cache:
+        for i in range(10):
+            cache.tokenize(f'🎉 {i}')
+
+    monkeypatch.setattr(token_cache, 'FLUSH_EVERY', 3)
+    with TokenCache(path) as cache:
+        for i in range(10):
+            cache.tokenize(f'🎉 {i}')
+            assert len(cache._used) < 3
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    with TokenCache(path, max_entries=2) as cache:
+        cache.tokenize('🎉 old')
+    with TokenCache(path, max_entries=2) as cache:
+        cache.tokenize('🎉 new')
+        cache.tokenize('😀 newer')
+    with TokenCache(path, max_entries=2) as cache:
+        assert cache.conn.execute('SELECT COUNT(*) FROM tokens').fetchone()[0] == 2
+        cache.tokenize('🎉 old')
+        assert cache.misses == 1
+
+
+def test_version_change_clears_the_cache(tmp_path, monkeypatch):
+    path = str(tmp_path / 'cache.sqlite')
+    with TokenCache(path) as cache:
+        cache.tokenize('🎉 a')
+
+    monkeypatch.setattr(token_cache, 'TOKENIZER_VERSION', token_cache.TOKENIZER_VERSION + 1)
+    with TokenCache(path) as cache:
+        assert cache.conn.execute('SELECT COUNT(*) FROM tokens').fetchone()[0] == 0
+        assert cache.tokenize('🎉 a') == ['🎉']
+        assert cache.misses == 1
+
+
+EMOJIS = [e for e in emoji.EMOJI_DATA if len(e) == 1][:600]
+
+
+def _texts(seed):
+    rnd = random.Random(seed)
+    return [' '.join(rnd.sample(EMOJIS, 5)) + f' text {seed} {i}' for i in range(100)]
+
+
+def _fill_cache(path, seed, barrier):
+    barrier.wait()
+    with TokenCache(path) as cache:
+        for text in _texts(seed):
+            cache.tokenize(text)
+
+
+@pytest.mark.parametrize('trial', range(10))
+def test_concurrent_cold_start(tmp_path, trial):
+    path = str(tmp_path / 'cache.sqlite')
+    workers = 8
+    barrier = multiprocessing.Barrier(workers)
+    processes = [multiprocessing.Process(target=_fill_cache, args=(path, seed, barrier))
+                 for seed in range(workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+
+    with TokenCache(path) as cache:
+        for seed in range(workers):
+            for text in _texts(seed):
+                assert cache.tokenize(text) == extract_complete_emojis(text)
+        assert cache.misses == 0
@@ -0,0 +1,146 @@
+import hashlib
+import sqlite3
+import time
+from array import array
+
+import emoji
+import pandas as pd
+
+from emoji_tokens import extract_complete_emojis
+
+
+# =============================================================================
+# Persistent tokenization cache
+# =============================================================================
+# Tokenization does not depend on the emoji categories, so re-running the
+# analysis after a category tweak should not tokenize anything again. The cache
+# maps a hash of the response text to its emoji sequence ids (ids into the
+# cache's own vocab table, stored as array('I') bytes). Entries are tied to
+# the tokenizer and emoji data release and the least recently used ones are
+# evicted once there are more than max_entries.
+
+CACHE_FILE = 'emoji_token_cache.sqlite'
+MAX_ENTRIES = 1_000_000
+
+# Pending writes / hit refreshes kept in memory before they are flushed
+FLUSH_EVERY = 10_000
+
+# Bump when extract_complete_emojis changes how text is split
+TOKENIZER_VERSION = 1
+
+
+class TokenCache:
+    """SQLite-backed replacement for extract_complete_emojis(text)"""
+
+    def __init__(self, path=CACHE_FILE, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.version = f'{TOKENIZER_VERSION}:emoji-{emoji.__version__}'
+        self.stamp = time.time_ns()
+        self.hits = 0
+        self.misses = 0
+
+        self._ids = {}          # emoji sequence -> vocab id
+        self._sequences = {}    # vocab id -> emoji sequence
+        self._new_entries = {}  # hash -> ids not written yet
+        self._used = []         # hashes hit since the last flush
+
+        # Several pipeline stages may share the file from different processes
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        with self.conn:
+            # Take the write lock before reading the version, so only one of several
+            # processes opening a fresh or stale file resets it. A second reset would
+            # drop vocab ids the first process has already handed out
+            self.conn.execute('BEGIN IMMEDIATE')
+            self.conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+            self.conn.execute('CREATE TABLE IF NOT EXISTS vocab '
+                              '(id INTEGER PRIMARY KEY, sequence TEXT UNIQUE NOT NULL)')
+            self.conn.execute('CREATE TABLE IF NOT EXISTS tokens '
+                              '(hash BLOB PRIMARY KEY, ids BLOB NOT NULL, used INTEGER NOT NULL)')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS tokens_used ON tokens (used)')
+
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != self.version:
+                # Different tokenizer or emoji release: every cached entry is stale
+                self.conn.execute('DELETE FROM tokens')
+                self.conn.execute('DELETE FROM vocab')
+                self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (self.version,))
+        self._load_vocab()
+
+    def _load_vocab(self):
+        for token_id, sequence in self.conn.execute('SELECT id, sequence FROM vocab'):
+            self._ids[sequence] = token_id
+            self._sequences[token_id] = sequence
+
+    def _sequence_id(self, sequence):
+        token_id = self._ids.get(sequence)
+        if token_id is None:
+            # New sequences are rare, so let SQLite hand out the id to keep ids
+            # consistent between processes sharing the cache
+            with self.conn:
+                self.conn.execute('INSERT OR IGNORE INTO vocab (sequence) VALUES (?)', (sequence,))
+            token_id = self.conn.execute('SELECT id FROM vocab WHERE sequence = ?', (sequence,)).fetchone()[0]
+            self._ids[sequence] = token_id
+            self._sequences[token_id] = sequence
+        return token_id
+
+    def _decode(self, blob):
+        ids = array('I')
+        ids.frombytes(blob)
+        if any(token_id not in self._sequences for token_id in ids):
+            # Another process added sequences since the vocab was loaded
+            self._load_vocab()
+        return [self._sequences[token_id] for token_id in ids]
+
+    def tokenize(self, text):
+        """Same result as extract_complete_emojis(text), tokenizing only on a cache miss"""
+        if pd.isna(text):
+            return []
+
+        key = hashlib.blake2b(str(text).encode('utf-8'), digest_size=16).digest()
+        blob = self._new_entries.get(key)
+        if blob is not None:
+            # Repeated in this run and not flushed yet; written with this run's stamp
+            self.hits += 1
+            return self._decode(blob)
+
+        row = self.conn.execute('SELECT ids FROM tokens WHERE hash = ?', (key,)).fetchone()
+        if row is not None:
+            self.hits += 1
+            self._used.append(key)
+            if len(self._used) >= FLUSH_EVERY:
+                self.flush()
+            return self._decode(row[0])
+
+        emoji_sequences = extract_complete_emojis(text)
+        ids = array('I', [self._sequence_id(sequence) for sequence in emoji_sequences])
+        self.misses += 1
+        self._new_entries[key] = ids.tobytes()
+        if len(self._new_entries) >= FLUSH_EVERY:
+            self.flush()
+        return emoji_sequences
+
+    def flush(self):
+        """Write new entries, refresh the hit entries and evict the least recently used"""
+        with self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO tokens (hash, ids, used) VALUES (?, ?, ?)',
+                                  [(key, blob, self.stamp) for key, blob in self._new_entries.items()])
+            self.conn.executemany('UPDATE tokens SET used = ? WHERE hash = ?',
+                                  [(self.stamp, key) for key in self._used])
+            excess = self.conn.execute('SELECT COUNT(*) FROM tokens').fetchone()[0] - self.max_entries
+            if excess > 0:
+                self.conn.execute('DELETE FROM tokens WHERE hash IN '
+                                  '(SELECT hash FROM tokens ORDER BY used LIMIT ?)', (excess,))
+        self._new_entries = {}
+        self._used = []
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()